@@ -1,3 +1,3 @@
-from rpygrep.base import RipGrepFind, RipGrepSearch
+from rpygrep.base import RipGrepFind, RipGrepSearch, arun_many
 
-__all__ = ["RipGrepFind", "RipGrepSearch"]
+__all__ = ["RipGrepFind", "RipGrepSearch", "arun_many"]
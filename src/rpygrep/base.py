@@ -1,47 +1,167 @@
+import asyncio
+import os
+import shlex
 import subprocess
+import sys
 from abc import ABC, abstractmethod
+from asyncio import StreamReader
 from asyncio.subprocess import Process, create_subprocess_exec
-from collections.abc import AsyncIterator, Iterator, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterable, Iterator, Sequence
+from contextlib import aclosing, suppress
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Any, ClassVar, Literal, Self, TypeVar, override
+from typing import Any, ClassVar, Literal, Self, TypedDict, cast, overload, override
 
-from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+import orjson
 
-from rpygrep.types import RIPGREP_TYPE_LIST, RipGrepBegin, RipGrepContext, RipGrepEnd, RipGrepMatch, RipGrepRow, RipGrepSearchResult
+from rpygrep.types import (
+    RIPGREP_TYPE_LIST,
+    RipGrepBegin,
+    RipGrepBeginData,
+    RipGrepContext,
+    RipGrepContextData,
+    RipGrepDataLines,
+    RipGrepDataPath,
+    RipGrepDataSubmatch,
+    RipGrepDataSubmatchMatch,
+    RipGrepEnd,
+    RipGrepEndData,
+    RipGrepEvent,
+    RipGrepMatch,
+    RipGrepMatchData,
+    RipGrepPartialResult,
+    RipGrepSearchResult,
+    RipGrepStats,
+    RipGrepStatsElapsed,
+)
 
-T = TypeVar("T", bound=BaseModel | list[str] | str)
+PIPE_SIZE = 1024 * 1024
+"""The capacity requested for the pipe ripgrep writes to when it is read synchronously, so it can run further ahead of the reader.
+Only honoured on Linux, and only where the kernel allows it; otherwise the pipe keeps its default size."""
 
+READ_CHUNK_SIZE = PIPE_SIZE
+"""The number of bytes to read from ripgrep's stdout at a time."""
 
-class BaseRipGrep(BaseModel, ABC):  # pyright: ignore[reportUnsafeMultipleInheritance]
-    model_config: ClassVar[ConfigDict] = ConfigDict(arbitrary_types_allowed=True, use_attribute_docstrings=True)
 
-    working_directory: Path = Field(default_factory=Path.cwd)
+def _open_stdout_pipe() -> tuple[int, int]:
+    """Open the pipe ripgrep writes to, grown to `PIPE_SIZE` where possible. Returns the read and write file descriptors."""
+    read_fd, write_fd = os.pipe()
+
+    if sys.platform == "linux":
+        import fcntl  # Unix-only, so imported here rather than at the top.
+
+        # Linux refuses this with EPERM above /proc/sys/fs/pipe-max-size or once the user's pipe quota is used up. It is only a speed-up,
+        # so carry on with the default size. Popen's own `pipesize` would raise instead, and leak the pipe while doing so.
+        with suppress(OSError):
+            _ = fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+
+    return read_fd, write_fd
+
+
+def _split_lines(pending: list[bytes], chunk: bytes) -> list[bytes]:
+    """Return the lines completed by `chunk`, keeping the unterminated remainder in `pending`.
+
+    The pieces of a line which spans several reads are joined once, when its newline arrives, rather than copied again on every read.
+    """
+    lines = chunk.split(b"\n")
+    tail = lines.pop()
+
+    if lines and pending:
+        pending.append(lines[0])
+        lines[0] = b"".join(pending)
+        pending.clear()
+
+    if tail:
+        pending.append(tail)
+
+    return lines
+
+
+def _iter_line_batches(fd: int) -> Iterator[list[bytes]]:
+    """Yield the complete lines of each chunk read from a file descriptor.
+
+    Lines are handed out a chunk at a time so callers loop over them directly instead of resuming a generator for every line.
+    """
+    pending: list[bytes] = []
+
+    while chunk := os.read(fd, READ_CHUNK_SIZE):
+        if lines := _split_lines(pending, chunk):
+            yield lines
+
+    if pending:
+        yield [b"".join(pending)]
+
+
+async def _aiter_line_batches(stream: StreamReader) -> AsyncIterator[list[bytes]]:
+    """Yield the complete lines of each chunk read from an asyncio stream. See `_iter_line_batches`."""
+    pending: list[bytes] = []
+
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        if lines := _split_lines(pending, chunk):
+            yield lines
+
+    if pending:
+        yield [b"".join(pending)]
+
+
+@dataclass(slots=True)
+class BaseRipGrep(ABC):
+    working_directory: Path = field(default_factory=Path.cwd)
     """The working directory for ripgrep."""
 
-    command: str = Field(default="rg")
+    command: str = "rg"
     """The ripgrep binary to invoke."""
 
-    singular_options: set[str] = Field(default_factory=set)
-    """Options which can only be added once."""
+    singular_options: list[str] = field(default_factory=list)
+    """Options which can only be added once, in the order they were added."""
 
-    multiple_options: list[str] = Field(default_factory=list)
+    multiple_options: list[str] = field(default_factory=list)
     """Options which can be added multiple times."""
 
-    targets: list[Path] = Field(default_factory=list)
+    targets: list[Path] = field(default_factory=list)
     """The directories and files to search."""
 
+    def _add_option(self, option: str) -> None:
+        """Add an option which can be added multiple times."""
+        self.multiple_options.append(option)
+
+    def _add_options(self, options: Iterable[str]) -> None:
+        """Add several options which can be added multiple times."""
+        self.multiple_options.extend(options)
+
+    def _add_valued_option(self, option: str, value: str) -> None:
+        """Add an option and its value as two separate argv entries."""
+        self.multiple_options.extend((option, value))
+
+    def _add_valued_options(self, option: str, values: Iterable[str]) -> None:
+        """Add an option once per value, each as two separate argv entries."""
+        extend = self.multiple_options.extend
+        for value in values:
+            extend((option, value))
+
+    def _add_singular_option(self, option: str) -> None:
+        """Add an option which can only be added once."""
+        # Checked against the list itself, which only ever holds a handful of options, so it stays right if the list is changed directly.
+        if option not in self.singular_options:
+            self.singular_options.append(option)
+
+    def _add_targets(self, targets: list[Path]) -> None:
+        """Add directories or files to search."""
+        self.targets.extend(targets)
+
     def case_sensitive(self, case_sensitive: bool) -> Self:
         """Ignore case when searching."""
         if not case_sensitive:
-            self.multiple_options.append("--ignore-case")
+            self._add_option("--ignore-case")
         return self
 
     def sort(self, by: Literal["none", "path", "name", "size", "accessed", "created", "modified"], ascending: bool = True) -> Self:
         """Sort the results. Will force ripgrep to use a single thread."""
         if ascending:
-            self.multiple_options.append(f"--sort={by}")
+            self._add_valued_option("--sort", by)
         else:
-            self.multiple_options.append(f"--sortr={by}")
+            self._add_valued_option("--sortr", by)
         return self
 
     def add_safe_defaults(self) -> Self:
@@ -51,62 +171,62 @@ class BaseRipGrep(BaseModel, ABC):  # pyright: ignore[reportUnsafeMultipleInheri
 
     def add_directories(self, directories: list[Path]) -> Self:
         """Add directories to the ripgrep command."""
-        self.targets.extend(directories)
+        self._add_targets(directories)
         return self
 
     def add_directory(self, directory: Path) -> Self:
         """Add a directory to the ripgrep command."""
-        self.targets.append(directory)
+        self._add_targets([directory])
         return self
 
     def include_glob(self, glob: str) -> Self:
         """Include files which match the given glob pattern."""
-        self.multiple_options.append(f"--glob={glob}")
+        self._add_valued_option("--glob", glob)
         return self
 
     def include_globs(self, globs: list[str]) -> Self:
         """Include files which match the given glob patterns."""
-        [self.include_glob(glob) for glob in globs]
+        self._add_valued_options("--glob", globs)
         return self
 
     def exclude_glob(self, glob: str) -> Self:
         """Exclude files which match the given glob pattern."""
-        self.multiple_options.append(f"--glob=!{glob}")
+        self._add_valued_option("--glob", "!" + glob)
         return self
 
     def exclude_globs(self, globs: list[str]) -> Self:
         """Exclude files which match the given glob patterns."""
-        [self.exclude_glob(glob) for glob in globs]
+        self._add_valued_options("--glob", ("!" + glob for glob in globs))
         return self
 
     def include_type(self, ripgrep_type: RIPGREP_TYPE_LIST) -> Self:
         """Only search files of the given type."""
-        self.multiple_options.append(f"--type={ripgrep_type}")
+        self._add_valued_option("--type", ripgrep_type)
         return self
 
     def include_types(self, ripgrep_types: Sequence[RIPGREP_TYPE_LIST]) -> Self:
         """Only search files of the given types."""
-        [self.include_type(ripgrep_type) for ripgrep_type in ripgrep_types]
+        self._add_valued_options("--type", ripgrep_types)
         return self
 
     def exclude_type(self, ripgrep_type: RIPGREP_TYPE_LIST) -> Self:
         """Exclude files of the given type."""
-        self.multiple_options.append(f"--type-not={ripgrep_type}")
+        self._add_valued_option("--type-not", ripgrep_type)
         return self
 
     def exclude_types(self, ripgrep_types: Sequence[RIPGREP_TYPE_LIST]) -> Self:
         """Exclude files of the given types."""
-        [self.exclude_type(ripgrep_type) for ripgrep_type in ripgrep_types]
+        self._add_valued_options("--type-not", ripgrep_types)
         return self
 
     def one_file_system(self) -> Self:
         """Only search the file system tree rooted at the path arguments."""
-        self.singular_options.add("--one-file-system")
+        self._add_singular_option("--one-file-system")
         return self
 
     def max_depth(self, depth: int) -> Self:
         """Only search this many levels of subdirectories."""
-        self.multiple_options.append(f"--max-depth={depth}")
+        self._add_valued_option("--max-depth", str(depth))
         return self
 
     def set_working_directory(self, path: Path) -> Self:
@@ -117,14 +237,76 @@ class BaseRipGrep(BaseModel, ABC):  # pyright: ignore[reportUnsafeMultipleInheri
     def _targets_str(self) -> list[str]:
         """Get the targets as a list of strings."""
 
-        return [str(target) for target in self.targets]
+        return list(map(os.fspath, self.targets))
 
-    @abstractmethod
-    def compile(self) -> list[str]: ...
+    def compile(self) -> list[str]:
+        """Compile the ripgrep command.
+
+        The command is built afresh on every call rather than cached, since the option and target lists can be changed directly.
+        """
+        return list(chain((self.command,), self.singular_options, self.multiple_options, self._targets_str()))
 
     def compile_str(self) -> str:
-        """Compile the ripgrep command."""
-        return " ".join(self.compile())
+        """Compile the ripgrep command into a string, quoted so it can be pasted into a shell."""
+        return shlex.join(self.compile())
+
+    def _run_batches(self) -> Iterator[list[bytes]]:
+        """Run the ripgrep command and return its raw lines of output, one batch per read from stdout."""
+        cli: list[str] = self.compile()
+
+        # We need to iterate over the lines as they are written to stdout:
+        read_fd, write_fd = _open_stdout_pipe()
+        try:
+            process = subprocess.Popen(  # noqa: S603
+                cli,
+                cwd=self.working_directory,
+                stdin=subprocess.DEVNULL,
+                stdout=write_fd,
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            # Only ripgrep writes to the pipe, so the read end sees EOF once it exits.
+            os.close(write_fd)
+
+        # Handing the read end over as the process's stdout means it is closed before the process is waited on, as with
+        # `stdout=PIPE`: a ripgrep that is stopped early sees a closed pipe rather than blocking on a full one.
+        # The pipe is read directly from its file descriptor, so Python-side buffering would go unused.
+        process.stdout = os.fdopen(read_fd, "rb", buffering=0)
+        with process:
+            yield from _iter_line_batches(read_fd)
+
+    async def _arun_batches(self) -> AsyncGenerator[list[bytes], None]:
+        """Run the ripgrep command and return its raw lines of output, one batch per read from stdout."""
+        cli: list[str] = self.compile()
+
+        # We need to iterate over the lines as they are written to stdout:
+        process: Process = await create_subprocess_exec(
+            cli[0],
+            *cli[1:],
+            cwd=self.working_directory,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            limit=128 * 1024 * 1024,  # 128kb
+            # No `pipesize` here: the event loop keeps draining the pipe into the StreamReader's buffer, so ripgrep does not stall
+            # on a full pipe, and alternative loops such as uvloop reject the argument.
+        )
+
+        if process.stdout is None:
+            msg = "No stdout from ripgrep process"
+            raise RuntimeError(msg)
+
+        try:
+            async for lines in _aiter_line_batches(process.stdout):
+                yield lines
+
+            _ = await process.wait()
+        finally:
+            # Stopped before the end of the output, by the caller or by cancellation: don't leave ripgrep running.
+            if process.returncode is None:
+                process.kill()
+                _ = await process.wait()
 
     @abstractmethod
     def run(self) -> Iterator[Any]: ...
@@ -140,72 +322,52 @@ class BaseRipGrep(BaseModel, ABC):  # pyright: ignore[reportUnsafeMultipleInheri
 class RipGrepFind(BaseRipGrep):
     """Use RipGrep to find files that match the given pattern."""
 
-    @override
-    def compile(self) -> list[str]:
-        """Compile the ripgrep command."""
-        return [
-            self.command,
-            *self.singular_options,
-            *self.multiple_options,
-            *self._targets_str(),
-        ]
+    __slots__: ClassVar[Iterable[str]] = ()
 
     @override
     def run(self) -> Iterator[Path]:
         """Run the ripgrep command and return the result."""
 
-        self.singular_options.add("--files")
+        self._add_singular_option("--files")
 
-        cli: list[str] = self.compile()
-
-        with subprocess.Popen(  # noqa: S603
-            cli,
-            cwd=self.working_directory,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            text=True,
-            universal_newlines=True,
-        ) as process:
-            if process.stdout is None:
-                msg = "No stdout from ripgrep process"
-                raise RuntimeError(msg)
-
-            for line in process.stdout.readlines():
-                yield Path(line.rstrip())
+        for lines in self._run_batches():
+            for line in lines:
+                yield Path(os.fsdecode(line))
 
     @override
-    async def arun(self) -> AsyncIterator[Path]:
+    async def arun(self) -> AsyncGenerator[Path, None]:
         """Run the ripgrep command and return the result."""
 
-        self.singular_options.add("--files")
+        self._add_singular_option("--files")
 
-        cli: list[str] = self.compile()
+        async with aclosing(self._arun_batches()) as batches:
+            async for lines in batches:
+                for line in lines:
+                    yield Path(os.fsdecode(line))
 
-        process: Process = await create_subprocess_exec(cli[0], *cli[1:], cwd=self.working_directory, stdout=subprocess.PIPE)
+    def run_paths_raw(self) -> Iterator[bytes]:
+        """Run the ripgrep command and return each path exactly as ripgrep printed it, without decoding it or building a `Path`."""
 
-        if process.stdout is None:
-            msg = "No stdout from ripgrep process"
-            raise RuntimeError(msg)
+        self._add_singular_option("--files")
 
-        async for line in process.stdout:
-            yield Path(line.decode("utf-8").rstrip())
+        for lines in self._run_batches():
+            yield from lines
 
+    async def arun_paths_raw(self) -> AsyncIterator[bytes]:
+        """Run the ripgrep command and return each path exactly as ripgrep printed it, without decoding it or building a `Path`."""
 
-class RipGrepSearch(BaseRipGrep):
-    """Use RipGrep to search for the given pattern in the given files."""
+        self._add_singular_option("--files")
 
-    model_config: ClassVar[ConfigDict] = ConfigDict(arbitrary_types_allowed=True, use_attribute_docstrings=True)
+        async with aclosing(self._arun_batches()) as batches:
+            async for lines in batches:
+                for line in lines:
+                    yield line
 
-    @override
-    def compile(self) -> list[str]:
-        """Compile the ripgrep command."""
 
-        return [
-            self.command,
-            *self.singular_options,
-            *self.multiple_options,
-            *self._targets_str(),
-        ]
+class RipGrepSearch(BaseRipGrep):
+    """Use RipGrep to search for the given pattern in the given files."""
+
+    __slots__: ClassVar[Iterable[str]] = ()
 
     @override
     def add_safe_defaults(self) -> Self:
@@ -220,171 +382,486 @@ class RipGrepSearch(BaseRipGrep):
 
     def add_extra_options(self, options: list[str]) -> Self:
         """Add extra options to the ripgrep command."""
-        self.multiple_options.extend(options)
+        self._add_options(options)
         return self
 
     def add_patterns(self, patterns: list[str]) -> Self:
         """Add patterns to the ripgrep command."""
-        [self.add_pattern(pattern) for pattern in patterns]
+        self._add_valued_options("--regexp", patterns)
         return self
 
     def add_pattern(self, pattern: str) -> Self:
         """Add a pattern to the ripgrep command."""
-        self.multiple_options.append(f"--regexp={pattern}")
+        self._add_valued_option("--regexp", pattern)
         return self
 
     def add_files(self, files: list[Path]) -> Self:
         """Add files to the ripgrep command."""
-        self.targets.extend(files)
+        self._add_targets(files)
         return self
 
     def add_file(self, file: Path) -> Self:
         """Add a file to the ripgrep command."""
-        self.targets.append(file)
+        self._add_targets([file])
         return self
 
     def before_context(self, context: int) -> Self:
         """Set the number of lines of context to include before the match."""
-        self.multiple_options.append(f"--before-context={context}")
+        self._add_valued_option("--before-context", str(context))
         return self
 
     def after_context(self, context: int) -> Self:
         """Set the number of lines of context to include after the match."""
-        self.multiple_options.append(f"--after-context={context}")
+        self._add_valued_option("--after-context", str(context))
         return self
 
     def auto_hybrid_regex(self) -> Self:
         """Enable hybrid regex matching. This allows for the use of regex patterns in the search terms."""
-        self.singular_options.add("--auto-hybrid-regex")
+        self._add_singular_option("--auto-hybrid-regex")
         return self
 
     def max_count(self, count: int) -> Self:
         """Set the maximum number of matches to return."""
-        self.multiple_options.append(f"--max-count={count}")
+        self._add_valued_option("--max-count", str(count))
         return self
 
     def max_file_size(self, size: int) -> Self:
         """Set the maximum file size to search."""
-        self.multiple_options.append(f"--max-filesize={size}")
+        self._add_valued_option("--max-filesize", str(size))
         return self
 
     def patterns_are_not_regex(self) -> Self:
         """Set the patterns to be treated as fixed strings."""
-        self.multiple_options.append("--fixed-strings")
+        self._add_option("--fixed-strings")
         return self
 
     def as_json(self) -> Self:
         """Enable JSON output."""
-        self.singular_options.add("--json")
+        self._add_singular_option("--json")
         return self
 
-    def run_direct(self) -> Iterator[str]:
-        """Run the ripgrep command and return the result."""
-        cli: list[str] = self.compile()
+    def run_direct(self) -> Iterator[bytes]:
+        """Run the ripgrep command and return the raw lines of output, without the trailing newline."""
+        for lines in self._run_batches():
+            yield from lines
 
-        # We need to iterate over the lines as they are written to stdout:
-        with subprocess.Popen(  # noqa: S603
-            cli,
-            cwd=self.working_directory,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            text=True,
-            errors="ignore",
-        ) as process:
-            if process.stdout is None:
-                msg = "No stdout from ripgrep process"
-                raise RuntimeError(msg)
+    async def arun_direct(self) -> AsyncIterator[bytes]:
+        """Run the ripgrep command and return the raw lines of output, without the trailing newline."""
+        async with aclosing(self._arun_batches()) as batches:
+            async for lines in batches:
+                for line in lines:
+                    yield line
 
-            while line := process.stdout.readline():
-                stripped_line = line.rstrip()
+    @overload
+    def run(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: Literal[False] = False
+    ) -> Iterator["RipGrepSearchResult"]: ...
 
-                yield stripped_line
+    @overload
+    def run(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: bool = False
+    ) -> Iterator["RipGrepSearchResult | RipGrepPartialResult"]: ...
 
-    async def arun_direct(self) -> AsyncIterator[str]:
-        """Run the ripgrep command and return the result."""
-        cli: list[str] = self.compile()
+    @override
+    def run(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: bool = False
+    ) -> Iterator["RipGrepSearchResult | RipGrepPartialResult"]:
+        """Run the ripgrep command and return the result.
+
+        `exclude_submatches` skips building the submatches of each match and `exclude_context` drops context lines without parsing them.
+        `first_match_yields` returns a `RipGrepPartialResult` as soon as each match arrives instead of waiting for ripgrep to finish the
+        file. The file's end event then yields a `RipGrepSearchResult` holding the file's context lines and end event, with no matches.
+        """
 
-        # We need to iterate over the lines as they are written to stdout:
-        process: Process = await create_subprocess_exec(
-            cli[0],
-            *cli[1:],
-            cwd=self.working_directory,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            limit=128 * 1024 * 1024,  # 128kb
+        _ = self.as_json()
+
+        result_processor = ResultProcessor(
+            exclude_submatches=exclude_submatches, exclude_context=exclude_context, first_match_yields=first_match_yields
         )
 
-        if process.stdout is None:
-            msg = "No stdout from ripgrep process"
-            raise RuntimeError(msg)
+        process_line = result_processor.process_line
+        for rows in self._run_batches():
+            for row in rows:
+                if result := process_line(row):
+                    yield result
 
-        while line_bytes := await process.stdout.readline():
-            line = line_bytes.decode("utf-8").rstrip()
+    @overload
+    def arun(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: Literal[False] = False
+    ) -> AsyncGenerator["RipGrepSearchResult", None]: ...
 
-            yield line
+    @overload
+    def arun(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: bool = False
+    ) -> AsyncGenerator["RipGrepSearchResult | RipGrepPartialResult", None]: ...
 
     @override
-    def run(self) -> Iterator["RipGrepSearchResult"]:
-        """Run the ripgrep command and return the result."""
+    async def arun(
+        self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: bool = False
+    ) -> AsyncGenerator["RipGrepSearchResult | RipGrepPartialResult", None]:
+        """Run the ripgrep command and return the result.
+
+        See `run` for the meaning of the arguments.
+        """
 
         _ = self.as_json()
 
-        result_processor = ResultProcessor()
+        result_processor = ResultProcessor(
+            exclude_submatches=exclude_submatches, exclude_context=exclude_context, first_match_yields=first_match_yields
+        )
 
-        for row in self.run_direct():
-            if result := result_processor.process_line(row):
-                yield result
+        process_line = result_processor.process_line
+        async with aclosing(self._arun_batches()) as batches:
+            async for rows in batches:
+                for row in rows:
+                    if result := process_line(row):
+                        yield result
 
-    @override
-    async def arun(self) -> AsyncIterator["RipGrepSearchResult"]:
-        """Run the ripgrep command and return the result."""
+    def run_stream(self) -> Iterator["RipGrepEvent"]:
+        """Run the ripgrep command and yield each event as soon as ripgrep emits it, without buffering the matches of a file."""
+
+        _ = self.as_json()
+
+        stream_processor = StreamingResultProcessor()
+
+        process_line = stream_processor.process_line
+        for rows in self._run_batches():
+            for row in rows:
+                if event := process_line(row):
+                    yield event
+
+    async def arun_stream(self) -> AsyncIterator["RipGrepEvent"]:
+        """Run the ripgrep command and yield each event as soon as ripgrep emits it, without buffering the matches of a file."""
 
         _ = self.as_json()
 
-        result_processor = ResultProcessor()
+        stream_processor = StreamingResultProcessor()
+
+        process_line = stream_processor.process_line
+        async with aclosing(self._arun_batches()) as batches:
+            async for rows in batches:
+                for row in rows:
+                    if event := process_line(row):
+                        yield event
+
+
+@overload
+def arun_many(searches: Sequence[RipGrepSearch], *, concurrency: int | None = None) -> AsyncIterator[tuple[int, "RipGrepSearchResult"]]: ...
+
+
+@overload
+def arun_many(searches: Sequence[RipGrepFind], *, concurrency: int | None = None) -> AsyncIterator[tuple[int, Path]]: ...
+
+
+async def arun_many(
+    searches: Sequence[RipGrepSearch] | Sequence[RipGrepFind], *, concurrency: int | None = None
+) -> AsyncIterator[tuple[int, "RipGrepSearchResult | Path"]]:
+    """Run several searches or finds concurrently and yield `(index, result)` pairs as the results arrive.
+
+    `index` is the position of the search in `searches`. At most `concurrency` ripgrep processes run at once, defaulting to
+    the number of CPUs. Sorting forces each ripgrep process onto a single thread, so searches that use `sort` gain the most
+    from running side by side.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+    queue: asyncio.Queue[tuple[int, RipGrepSearchResult | Path] | None] = asyncio.Queue()
+
+    async def drain(index: int, search: RipGrepSearch | RipGrepFind) -> None:
+        async with semaphore, aclosing(search.arun()) as results:
+            async for result in results:
+                await queue.put((index, result))
+
+    tasks = [asyncio.create_task(drain(index, search)) for index, search in enumerate(searches)]
+
+    all_done = asyncio.gather(*tasks)
+    all_done.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        while (item := await queue.get()) is not None:
+            yield item
+
+        # Re-raise the first failure, if any search failed.
+        _ = await all_done
+    finally:
+        _ = all_done.cancel()
+        for task in tasks:
+            _ = task.cancel()
+
+        _ = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Retrieve the outcome of `all_done` too, so stopping early does not leave an exception that asyncio logs as never retrieved.
+        _ = await asyncio.gather(all_done, return_exceptions=True)
+
+
+# The shapes of the event data in ripgrep's JSON output, so the decoded dicts are typed where the events are built from them.
+class _TextJson(TypedDict):
+    text: str
+
+
+class _LinesJson(TypedDict, total=False):
+    text: str
+    bytes: str
+
+
+class _SubmatchJson(TypedDict):
+    match: _TextJson
+    start: int
+    end: int
+
+
+class _ElapsedJson(TypedDict):
+    secs: int
+    nanos: int
+    human: str
+
+
+class _StatsJson(TypedDict):
+    elapsed: _ElapsedJson
+    searches: int
+    searches_with_match: int
+    bytes_searched: int
+    bytes_printed: int
+    matched_lines: int
+    matches: int
+
+
+class _BeginJson(TypedDict):
+    path: _TextJson
+
+
+class _LineJson(TypedDict):
+    """The data of a match or context event."""
+
+    path: _TextJson
+    lines: _LinesJson
+    line_number: int
+    absolute_offset: int
+    submatches: list[_SubmatchJson]
+
+
+class _EndJson(TypedDict):
+    path: _TextJson
+    binary_offset: int | None
+    stats: _StatsJson
+
+
+class _EventJson(TypedDict):
+    type: Literal["begin", "match", "context", "end", "summary"]
+    data: _BeginJson | _LineJson | _EndJson | dict[str, object]
+
+
+def _load_event(line: bytes | str) -> _EventJson:
+    """Decode a line of ripgrep's JSON output."""
+    return cast("_EventJson", orjson.loads(line))
+
+
+def _mk_submatches(submatches: list[_SubmatchJson]) -> list[RipGrepDataSubmatch]:
+    return [
+        RipGrepDataSubmatch(match=RipGrepDataSubmatchMatch(text=submatch["match"]["text"]), start=submatch["start"], end=submatch["end"])
+        for submatch in submatches
+    ]
+
+
+def _mk_lines(lines: _LinesJson) -> RipGrepDataLines:
+    return RipGrepDataLines(text=lines.get("text"), bytes=lines.get("bytes"))
+
 
-        async for row in self.arun_direct():
-            if result := result_processor.process_line(row):
-                yield result
+def _mk_stats(stats: _StatsJson) -> RipGrepStats:
+    elapsed = stats["elapsed"]
+    return RipGrepStats(
+        elapsed=RipGrepStatsElapsed(secs=elapsed["secs"], nanos=elapsed["nanos"], human=elapsed["human"]),
+        searches=stats["searches"],
+        searches_with_match=stats["searches_with_match"],
+        bytes_searched=stats["bytes_searched"],
+        bytes_printed=stats["bytes_printed"],
+        matched_lines=stats["matched_lines"],
+        matches=stats["matches"],
+    )
+
+
+def _mk_begin(data: _BeginJson) -> RipGrepBegin:
+    return RipGrepBegin(type="begin", data=RipGrepBeginData(path=RipGrepDataPath(text=data["path"]["text"])))
+
+
+def _mk_path(data: _LineJson | _EndJson, path: RipGrepDataPath | None) -> RipGrepDataPath:
+    """Reuse `path`, the path of the file's begin event, when there is one rather than building a copy for every event."""
+    return path if path is not None else RipGrepDataPath(text=data["path"]["text"])
+
+
+def _mk_match(data: _LineJson, exclude_submatches: bool = False, path: RipGrepDataPath | None = None) -> RipGrepMatch:
+    return RipGrepMatch(
+        type="match",
+        data=RipGrepMatchData(
+            path=_mk_path(data, path),
+            lines=_mk_lines(data["lines"]),
+            line_number=data["line_number"],
+            absolute_offset=data["absolute_offset"],
+            submatches=[] if exclude_submatches else _mk_submatches(data["submatches"]),
+        ),
+    )
+
+
+def _mk_context(data: _LineJson, path: RipGrepDataPath | None = None) -> RipGrepContext:
+    return RipGrepContext(
+        type="context",
+        data=RipGrepContextData(
+            path=_mk_path(data, path),
+            lines=_mk_lines(data["lines"]),
+            line_number=data["line_number"],
+            absolute_offset=data["absolute_offset"],
+            submatches=_mk_submatches(data["submatches"]),
+        ),
+    )
+
+
+def _mk_end(data: _EndJson, path: RipGrepDataPath | None = None) -> RipGrepEnd:
+    return RipGrepEnd(
+        type="end",
+        data=RipGrepEndData(
+            path=_mk_path(data, path),
+            binary_offset=data["binary_offset"],
+            stats=_mk_stats(data["stats"]),
+        ),
+    )
 
 
 class ResultProcessor:
+    __slots__: tuple[str, ...] = ("_handlers", "begin", "context", "end", "exclude_submatches", "first_match_yields", "matches", "path")
+
     begin: "RipGrepBegin | None"
     matches: list["RipGrepMatch"]
     context: list["RipGrepContext"]
     end: "RipGrepEnd | None"
+    path: "RipGrepDataPath | None"
+    """The path of the current file, shared by all of the file's events instead of each building its own."""
 
-    def __init__(self) -> None:
+    def __init__(self, exclude_submatches: bool = False, exclude_context: bool = False, first_match_yields: bool = False) -> None:
         self.begin = None
         self.matches = []
         self.context = []
         self.end = None
+        self.path = None
+
+        self.exclude_submatches: bool = exclude_submatches
+        self.first_match_yields: bool = first_match_yields
+
+        # Handlers for each ripgrep JSON event, keyed by the event's "type" discriminator. Each builds only the dataclass it needs,
+        # and the options are resolved here once so the handlers do not re-check them for every line.
+        # Each handler takes the data of its own event type, which the table's value type cannot express, hence `Any`.
+        self._handlers: dict[str, Callable[[Any], RipGrepSearchResult | RipGrepPartialResult | None]] = {
+            "begin": self._on_begin,
+            "match": self._on_match_and_yield if first_match_yields else self._on_match,
+            "context": self._ignore if exclude_context else self._on_context,
+            "end": self._on_end,
+            "summary": self._ignore,
+        }
+
+    def process_line(self, line: bytes | str) -> "RipGrepSearchResult | RipGrepPartialResult | None":
+        """Process a line of stdout from ripgrep.
+
+        When `first_match_yields` is set, a `RipGrepPartialResult` is returned for every match. The file's end event then produces a
+        result with the file's context lines and its end event, but no matches.
+        """
 
-        self.adapter: TypeAdapter[RipGrepRow] = TypeAdapter(RipGrepRow)
+        obj = _load_event(line)
 
-    def process_line(self, line: str) -> "RipGrepSearchResult | None":
-        """Process a line of stdout from ripgrep."""
+        return self._handlers[obj["type"]](obj["data"])
 
-        model = self.adapter.validate_json(line)
+    def _on_begin(self, data: _BeginJson) -> "RipGrepSearchResult | None":
+        self.begin = _mk_begin(data)
+        self.path = self.begin.data.path
+        return None
+
+    def _on_match(self, data: _LineJson) -> "RipGrepSearchResult | None":
+        self.matches.append(_mk_match(data, self.exclude_submatches, self.path))
+        return None
+
+    def _on_match_and_yield(self, data: _LineJson) -> "RipGrepPartialResult | None":
+        if not self.begin:
+            return None
+
+        return RipGrepPartialResult(
+            path=Path(self.begin.data.path.text), begin=self.begin, match=_mk_match(data, self.exclude_submatches, self.path)
+        )
 
-        if isinstance(model, RipGrepMatch):
-            self.matches.append(model)
-        elif isinstance(model, RipGrepContext):
-            self.context.append(model)
-        elif isinstance(model, RipGrepBegin):
-            self.begin = model
-        elif isinstance(model, RipGrepEnd):
-            self.end = model
+    def _on_context(self, data: _LineJson) -> "RipGrepSearchResult | None":
+        self.context.append(_mk_context(data, self.path))
+        return None
+
+    def _on_end(self, data: _EndJson) -> "RipGrepSearchResult | None":
+        self.end = _mk_end(data, self.path)
+
+        if not self.begin:
+            return None
 
-        if self.begin and self.end:
-            path = Path(self.begin.data.path.text)
-            result = RipGrepSearchResult(path=path, begin=self.begin, matches=self.matches, context=self.context, end=self.end)
+        result = self._take_result(self.begin, self.end)
 
-            self.begin = None
-            self.matches = []
-            self.context = []
-            self.end = None
+        self.begin = None
+        self.end = None
+        self.path = None
 
-            return result
+        return result
 
+    def _ignore(self, _data: object) -> "RipGrepSearchResult | None":
         return None
+
+    def _take_result(self, begin: "RipGrepBegin", end: "RipGrepEnd") -> "RipGrepSearchResult":
+        """Build a result from the matches and context collected so far and start collecting afresh."""
+
+        result = RipGrepSearchResult(path=Path(begin.data.path.text), begin=begin, matches=self.matches, context=self.context, end=end)
+
+        self.matches = []
+        self.context = []
+
+        return result
+
+
+class StreamingResultProcessor:
+    """Process lines of stdout from ripgrep into individual events, without accumulating the matches of a file."""
+
+    __slots__: tuple[str, ...] = ("begin", "path")
+
+    begin: "RipGrepBegin | None"
+    path: "RipGrepDataPath | None"
+    """The path of the current file, shared by all of the file's events as in `ResultProcessor`."""
+
+    def __init__(self) -> None:
+        self.begin = None
+        self.path = None
+
+    def process_line(self, line: bytes | str) -> "RipGrepEvent | None":
+        """Process a line of stdout from ripgrep. The begin event of the current file is kept in `begin` until its end event."""
+
+        obj = _load_event(line)
+
+        return self._HANDLERS[obj["type"]](self, obj["data"])
+
+    def _on_begin(self, data: _BeginJson) -> "RipGrepEvent | None":
+        self.begin = _mk_begin(data)
+        self.path = self.begin.data.path
+        return "begin", self.begin
+
+    def _on_match(self, data: _LineJson) -> "RipGrepEvent | None":
+        return "match", _mk_match(data, path=self.path)
+
+    def _on_context(self, data: _LineJson) -> "RipGrepEvent | None":
+        return "context", _mk_context(data, self.path)
+
+    def _on_end(self, data: _EndJson) -> "RipGrepEvent | None":
+        end = _mk_end(data, self.path)
+        self.begin = None
+        self.path = None
+        return "end", end
+
+    def _ignore(self, _data: object) -> "RipGrepEvent | None":
+        return None
+
+    # The handler for each ripgrep JSON event, keyed by the event's "type" discriminator. Built once for the class rather than for every
+    # processor; as in `ResultProcessor`, each handler takes the data of its own event type, hence `Any`.
+    _HANDLERS: ClassVar[dict[str, Callable[["StreamingResultProcessor", Any], "RipGrepEvent | None"]]] = {
+        "begin": _on_begin,
+        "match": _on_match,
+        "context": _on_context,
+        "end": _on_end,
+        "summary": _ignore,
+    }
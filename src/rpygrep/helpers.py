@@ -1,11 +1,14 @@
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
 from typing import Self
 
 from rpygrep.types import RipGrepContext, RipGrepMatch, RipGrepSearchResult
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchedLine:
     """A match in a file entry."""
 
@@ -19,7 +22,7 @@ class MatchedLine:
     """The lines of text after the line"""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchedFile:
     """A file with matches."""
 
@@ -30,14 +33,37 @@ class MatchedFile:
 
     @classmethod
     def from_search_results(
-        cls, search_results: list[RipGrepSearchResult], before_context: int, after_context: int, include_empty_lines: bool = False
+        cls,
+        search_results: list[RipGrepSearchResult],
+        before_context: int,
+        after_context: int,
+        include_empty_lines: bool = False,
+        max_workers: int = 1,
     ) -> list[Self]:
-        return [
-            cls.from_search_result(search_result, before_context, after_context, include_empty_lines) for search_result in search_results
-        ]
+        """Convert each search result with `from_search_result`, keeping their order.
+
+        With `max_workers` above 1 the results are converted on a thread pool. This only pays off on free-threaded Python builds,
+        as the conversion is pure Python and otherwise holds the GIL.
+        """
+        if max_workers <= 1:
+            return [
+                cls.from_search_result(search_result, before_context, after_context, include_empty_lines)
+                for search_result in search_results
+            ]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    cls.from_search_result,
+                    search_results,
+                    repeat(before_context),
+                    repeat(after_context),
+                    repeat(include_empty_lines),
+                )
+            )
 
     @classmethod
-    def from_search_result(  # noqa: PLR0912
+    def from_search_result(
         cls, search_result: RipGrepSearchResult, before_context: int, after_context: int, include_empty_lines: bool = False
     ) -> Self:
         """Attach context to the matches in the search result and produce a list of FileEntryMatches."""
@@ -46,45 +72,49 @@ class MatchedFile:
 
         matches_by_line_number: dict[int, RipGrepMatch] = {match.data.line_number: match for match in search_result.matches}
 
-        matched_lines: list[MatchedLine] = []
+        # Sorted line numbers let each match find the context lines and neighbouring matches in its window by bisecting,
+        # rather than probing every line number in the window.
+        context_line_numbers: list[int] = sorted(line_context_by_line_number)
+        match_line_numbers: list[int] = sorted(matches_by_line_number)
 
-        for line_match in search_result.matches:
-            if not line_match.data.lines.text:
-                continue
+        def take_context(start: int, stop: int) -> dict[int, str]:
+            """Take the context lines in [start, stop), stopping at the first match in that range."""
+            context_lines: dict[int, str] = {}
 
-            before_context_lines: dict[int, str] = {}
-            after_context_lines: dict[int, str] = {}
+            # Do not steal context from the next match
+            next_match = bisect_left(match_line_numbers, start)
+            if next_match < len(match_line_numbers) and match_line_numbers[next_match] < stop:
+                stop = match_line_numbers[next_match]
 
-            # Find the before context lines
-            for line_number in range(line_match.data.line_number - before_context, line_match.data.line_number):
-                if line_number in matches_by_line_number:
-                    # Do not steal context from the next match
-                    break
+            first = bisect_left(context_line_numbers, start)
+            last = bisect_left(context_line_numbers, stop, lo=first)
 
+            for line_number in context_line_numbers[first:last]:
                 if line := line_context_by_line_number.pop(line_number, None):  # noqa: SIM102
                     if text := line.data.lines.text:
                         if stripped_line := text.rstrip():
-                            before_context_lines[line_number] = stripped_line
+                            context_lines[line_number] = stripped_line
                         elif include_empty_lines:
-                            before_context_lines[line_number] = ""
+                            context_lines[line_number] = ""
 
-            # Find the after context lines
-            for line_number in range(line_match.data.line_number + 1, line_match.data.line_number + after_context + 1):
-                if line_number in matches_by_line_number:
-                    # Do not steal context from the next match
-                    break
+            return context_lines
 
-                if line := line_context_by_line_number.pop(line_number, None):  # noqa: SIM102
-                    if text := line.data.lines.text:
-                        if stripped_line := text.rstrip():
-                            after_context_lines[line_number] = stripped_line
-                        elif include_empty_lines:
-                            after_context_lines[line_number] = ""
+        matched_lines: list[MatchedLine] = []
+
+        for line_match in search_result.matches:
+            match_text = line_match.data.lines.text
+            if not match_text:
+                continue
+
+            match_line_number = line_match.data.line_number
+
+            before_context_lines = take_context(match_line_number - before_context, match_line_number)
+            after_context_lines = take_context(match_line_number + 1, match_line_number + after_context + 1)
 
             matched_lines.append(
                 MatchedLine(
                     before=before_context_lines,
-                    match={line_match.data.line_number: line_match.data.lines.text.rstrip()},
+                    match={match_line_number: match_text.rstrip()},
                     after=after_context_lines,
                 )
             )
@@ -1,8 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Annotated, Literal
-
-from pydantic import Field
+from typing import Literal
 
 RIPGREP_TYPE_LIST = Literal[
     "ada",
@@ -214,19 +212,19 @@ RIPGREP_TYPE_LIST = Literal[
 ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepDataPath:
     text: str
     """The path to the file that matched the pattern."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepBeginData:
     path: RipGrepDataPath
     """The path to the file that matched the pattern."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepBegin:
     type: Literal["begin"]
     """The type of the event."""
@@ -235,13 +233,13 @@ class RipGrepBegin:
     """The data for the begin event."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepDataSubmatchMatch:
     text: str
     """The text of the match."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepDataSubmatch:
     match: RipGrepDataSubmatchMatch
     """The match."""
@@ -253,7 +251,7 @@ class RipGrepDataSubmatch:
     """The end index of the match."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepDataLines:
     text: str | None = None
     """The lines of text that matched the pattern."""
@@ -262,7 +260,7 @@ class RipGrepDataLines:
     """The bytes of the lines that matched the pattern."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepMatchData:
     path: RipGrepDataPath
     """The path to the file that matched the pattern."""
@@ -280,7 +278,7 @@ class RipGrepMatchData:
     """The submatches of the line that matched the pattern."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepMatch:
     type: Literal["match"]
     """The type of the event."""
@@ -289,7 +287,7 @@ class RipGrepMatch:
     """The data for the match event."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepContextData:
     path: RipGrepDataPath
     """The path to the file that matched the pattern."""
@@ -307,7 +305,7 @@ class RipGrepContextData:
     """The submatches of the line that matched the pattern."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepContext:
     type: Literal["context"]
     """The type of the event."""
@@ -316,7 +314,7 @@ class RipGrepContext:
     """The data for the context event."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepStatsElapsed:
     secs: int
     """The number of seconds."""
@@ -328,7 +326,7 @@ class RipGrepStatsElapsed:
     """The human readable time."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepStats:
     elapsed: RipGrepStatsElapsed
     """The elapsed time of the search."""
@@ -352,7 +350,7 @@ class RipGrepStats:
     """The number of matches."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepEndData:
     path: RipGrepDataPath
     """The path to the file that matched the pattern."""
@@ -364,7 +362,7 @@ class RipGrepEndData:
     """The stats of the search."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepEnd:
     type: Literal["end"]
     """The type of the event."""
@@ -373,7 +371,7 @@ class RipGrepEnd:
     """The data for the end event."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepSummaryElapsedTotal:
     human: str
     """The human readable time."""
@@ -385,7 +383,7 @@ class RipGrepSummaryElapsedTotal:
     """The number of seconds."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepSummaryData:
     elapsed_total: RipGrepSummaryElapsedTotal
     """The elapsed time of the search."""
@@ -394,7 +392,7 @@ class RipGrepSummaryData:
     """The stats of the search."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepSummary:
     type: Literal["summary"]
     """The type of the event."""
@@ -403,10 +401,14 @@ class RipGrepSummary:
     """The data for the summary event."""
 
 
-RipGrepRow = Annotated[RipGrepMatch | RipGrepContext | RipGrepBegin | RipGrepEnd | RipGrepSummary, Field(discriminator="type")]
+RipGrepRow = RipGrepMatch | RipGrepContext | RipGrepBegin | RipGrepEnd | RipGrepSummary
+"""Any event in ripgrep's JSON output. The `type` field tells the events apart."""
+
+RipGrepEvent = tuple[Literal["begin", "match", "context", "end"], RipGrepBegin | RipGrepMatch | RipGrepContext | RipGrepEnd]
+"""A single ripgrep event and its type, as yielded by `RipGrepSearch.run_stream`."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RipGrepSearchResult:
     path: Path
     """The path to the file that matched the pattern."""
@@ -422,3 +424,17 @@ class RipGrepSearchResult:
 
     end: RipGrepEnd
     """The end event."""
+
+
+@dataclass(frozen=True, slots=True)
+class RipGrepPartialResult:
+    """A single match, yielded as soon as ripgrep reports it when searching with `first_match_yields`."""
+
+    path: Path
+    """The path to the file that matched the pattern."""
+
+    begin: RipGrepBegin
+    """The begin event of the file."""
+
+    match: RipGrepMatch
+    """The match."""
@@ -1,83 +1,136 @@
 import asyncio
+import gc
+import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import aclosing
+from dataclasses import replace
+from itertools import chain, pairwise
+from operator import attrgetter
 from pathlib import Path, PosixPath
-from typing import Any
+from typing import Any, TypeVar
 
+import orjson
 import pytest
-from deepdiff import DeepDiff
 from dirty_equals import IsInt, IsStr
 from inline_snapshot import snapshot
-from pydantic import TypeAdapter
 
-from rpygrep import RipGrepFind, RipGrepSearch
+from rpygrep import RipGrepFind, RipGrepSearch, arun_many, base
 from rpygrep.helpers import MatchedFile, MatchedLine
 from rpygrep.types import (
+    RipGrepEvent,
+    RipGrepPartialResult,
     RipGrepSearchResult,
+    RipGrepStatsElapsed,
 )
 
+try:
+    from uvloop import new_event_loop
+except ImportError:
+    from asyncio import new_event_loop
+
+T = TypeVar("T")
+
+# One event loop drives the async half of every sync/async comparison, rather than a loop being set up per call.
+# As in conftest.py, it runs on uvloop when uvloop is installed.
+_RUNNER = asyncio.Runner(loop_factory=new_event_loop)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _close_runner() -> Iterator[None]:
+    yield
+    _RUNNER.close()
+
+
+async def collect(iterator: AsyncIterator[T]) -> list[T]:
+    """Drain an async iterator into a list."""
+    return [item async for item in iterator]
+
 
 def dump_result_for_snapshot(rip_grep_search_result: list[RipGrepSearchResult], /) -> list[dict[str, Any]]:
-    type_adapter = TypeAdapter[RipGrepSearchResult](type=RipGrepSearchResult)
+    # orjson serializes the (slotted) dataclasses natively; paths are the only values it needs help with.
+    return orjson.loads(orjson.dumps(rip_grep_search_result, default=os.fspath))
 
-    return [type_adapter.dump_python(result, mode="json") for result in rip_grep_search_result]
 
+# Timings differ between any two runs of ripgrep, so they are blanked before comparing results.
+_NO_ELAPSED = RipGrepStatsElapsed(secs=0, nanos=0, human="")
 
-EXCLUDED_PATH_REGEX = [
-    r"root\[\d+\]\.end\.data\.stats\.elapsed.*",
-]
+
+def strip_elapsed(result: RipGrepSearchResult) -> RipGrepSearchResult:
+    end_data = result.end.data
+    stats = replace(end_data.stats, elapsed=_NO_ELAPSED)
+    return replace(result, end=replace(result.end, data=replace(end_data, stats=stats)))
+
+
+# Comparing every sync run against its async twin doubles the ripgrep processes per test, so it is opt-in; CI sets this.
+PARITY = bool(os.environ.get("RPYGREP_PARITY"))
+
+_BY_PATH = attrgetter("path")
 
 
 def sort_results(results: list[RipGrepSearchResult]) -> list[RipGrepSearchResult]:
-    return sorted(results, key=lambda x: x.path)
+    return sorted(results, key=_BY_PATH)
 
 
 def run_search(ripgrep_search: RipGrepSearch) -> list[RipGrepSearchResult]:
-    """Run the search through the sync and async code paths and ensure the results are the same."""
-    sync_results = sort_results(list(ripgrep_search.run()))
+    """Run the search through the sync and async code paths and ensure the results are the same.
 
-    async def materialize_async_results() -> list[RipGrepSearchResult]:
-        iterator = ripgrep_search.arun()
-        return sort_results([result async for result in iterator])
+    The sync run happens on a worker thread while the async run proceeds, so the two ripgrep processes overlap.
+    Without `RPYGREP_PARITY` set, only the sync path runs.
+    """
+    if not PARITY:
+        return sort_results(list(ripgrep_search.run()))
 
-    async_results = asyncio.get_event_loop().run_until_complete(materialize_async_results())
+    # `run` and `arun` both add --json; adding it up front means neither thread changes the builder.
+    _ = ripgrep_search.as_json()
 
-    diff_results = DeepDiff(sync_results, async_results, threshold_to_diff_deeper=0, exclude_regex_paths=EXCLUDED_PATH_REGEX)
+    async def run_both() -> tuple[list[RipGrepSearchResult], list[RipGrepSearchResult]]:
+        sync_future = asyncio.get_running_loop().run_in_executor(None, lambda: list(ripgrep_search.run()))
+        async_results = await collect(ripgrep_search.arun())
+        return await sync_future, async_results
 
-    assert diff_results == {}
+    sync_results, async_results = _RUNNER.run(run_both())
+    sync_results, async_results = sort_results(sync_results), sort_results(async_results)
+
+    assert list(map(strip_elapsed, sync_results)) == list(map(strip_elapsed, async_results))
 
     return sync_results
 
 
 def run_find(ripgrep_find: RipGrepFind, sort: bool = True) -> list[Path]:
-    """Run the find through the sync and async code paths and ensure the results are the same."""
-    sync_results = list(ripgrep_find.run())
+    """Run the find through the sync and async code paths and ensure the results are the same.
+
+    As in `run_search`, the sync run happens on a worker thread while the async run proceeds.
+    Without `RPYGREP_PARITY` set, only the sync path runs.
+    """
+    if not PARITY:
+        sync_results = list(ripgrep_find.run())
+        return sorted(sync_results) if sort else sync_results
 
-    async def materialize_async_results() -> list[Path]:
-        iterator = ripgrep_find.arun()
-        return [result async for result in iterator]
+    # `run` and `arun` both add --files; adding it up front means neither thread changes the builder.
+    ripgrep_find._add_singular_option("--files")  # pyright: ignore[reportPrivateUsage]
 
-    async_results = asyncio.get_event_loop().run_until_complete(materialize_async_results())
-    diff_results = DeepDiff(sync_results, async_results, threshold_to_diff_deeper=0, exclude_regex_paths=EXCLUDED_PATH_REGEX)
+    async def run_both() -> tuple[list[Path], list[Path]]:
+        sync_future = asyncio.get_running_loop().run_in_executor(None, lambda: list(ripgrep_find.run()))
+        async_results = await collect(ripgrep_find.arun())
+        return await sync_future, async_results
 
-    assert diff_results == {}
+    sync_results, async_results = _RUNNER.run(run_both())
+    assert sync_results == async_results
 
     return sorted(sync_results) if sort else sync_results
 
 
-def prepare_for_snapshot(results: list[RipGrepSearchResult]) -> list[str]:
-    type_adapter = TypeAdapter(RipGrepSearchResult)
-    return [type_adapter.dump_python(result) for result in results]
+def option_pairs(compiled: list[str]) -> list[tuple[str, str]]:
+    """Pair each argv entry with the one after it, so `("--flag", "value")` can be looked up."""
+    return list(pairwise(compiled))
 
 
-# @pytest.fixture
-# async def temp_dir():
-#     with tempfile.TemporaryDirectory() as temp_dir:
-#         await create_test_structure(Path(temp_dir))
-#         yield Path(temp_dir)
+DATASET_DIR = Path(__file__).parent / "dataset"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dataset_dir() -> Path:
-    return Path(__file__).parent / "dataset"
+    return DATASET_DIR
 
 
 class TestRipGrepSearch:
@@ -85,15 +138,7 @@ class TestRipGrepSearch:
         search = RipGrepSearch(working_directory=dataset_dir)
         assert search.working_directory == dataset_dir
         assert search.command == "rg"
-        assert search.singular_options == set()
-        assert search.multiple_options == []
-        assert search.targets == []
-
-    def test_init_two(self, dataset_dir: Path):
-        search = RipGrepSearch(working_directory=dataset_dir)
-        assert search.working_directory == dataset_dir
-        assert search.command == "rg"
-        assert search.singular_options == set()
+        assert search.singular_options == []
         assert search.multiple_options == []
         assert search.targets == []
 
@@ -719,6 +764,58 @@ class TestRipGrepSearch:
             ]
         )
 
+    def test_exclude_submatches_and_context(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.add_pattern("hello").after_context(1)
+
+        results = list(ripgrep_search.run(exclude_submatches=True, exclude_context=True))
+
+        assert len(results) == 1
+        assert [match.data.line_number for match in results[0].matches] == [7, 10]
+        assert all(match.data.submatches == [] for match in results[0].matches)
+        assert results[0].context == []
+
+    def test_events_share_path(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.add_pattern("hello").before_context(1)
+
+        for result in run_search(ripgrep_search):
+            path = result.begin.data.path
+            assert all(event.data.path is path for event in [*result.matches, *result.context, result.end])
+
+    def test_first_match_yields(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.add_pattern("hello").after_context(1)
+
+        results = list(ripgrep_search.run(first_match_yields=True))
+
+        # Each match arrives on its own, without context; the file's context lines all come with its end event.
+        assert [type(result).__name__ for result in results] == snapshot(
+            ["RipGrepPartialResult", "RipGrepPartialResult", "RipGrepSearchResult"]
+        )
+
+        *partial_results, final_result = results
+        assert [result.match.data.line_number for result in partial_results if isinstance(result, RipGrepPartialResult)] == snapshot(
+            [7, 10]
+        )
+
+        assert isinstance(final_result, RipGrepSearchResult)
+        assert final_result.matches == []
+        assert [context.data.line_number for context in final_result.context] == snapshot([8, 11])
+        assert final_result.end.data.stats.matches == 2
+
+    def test_run_stream(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.add_pattern("hello").after_context(1)
+
+        events = list(ripgrep_search.run_stream())
+
+        async_events: list[RipGrepEvent] = _RUNNER.run(collect(ripgrep_search.arun_stream()))
+
+        assert [kind for kind, _ in events] == snapshot(["begin", "match", "context", "match", "context", "end"])
+        assert [kind for kind, _ in async_events] == [kind for kind, _ in events]
+        assert {event.data.path.text for _, event in events} == {"hello_world.go"}
+
+        # Every event of a file reuses the begin event's path.
+        begin_path = events[0][1].data.path
+        assert all(event.data.path is begin_path for _, event in events)
+
     def test_compile(self, ripgrep_search: RipGrepSearch):
         _ = ripgrep_search.add_pattern("test").case_sensitive(False).max_count(5)
         compiled = ripgrep_search.compile()
@@ -726,16 +823,34 @@ class TestRipGrepSearch:
         assert compiled[0] == "rg"
         assert "--json" not in compiled  # Only added during run()
         assert "--ignore-case" in compiled
-        assert "--regexp=test" in compiled
-        assert "--max-count=5" in compiled
+        assert ("--regexp", "test") in option_pairs(compiled)
+        assert ("--max-count", "5") in option_pairs(compiled)
+
+    def test_compile_after_change(self, ripgrep_search: RipGrepSearch, dataset_dir: Path):
+        _ = ripgrep_search.add_pattern("test")
+        first = ripgrep_search.compile()
+        first.append("--not-an-option")
+
+        assert ripgrep_search.compile() == first[:-1]
+
+        _ = ripgrep_search.max_count(5).add_file(dataset_dir / "hello_world.go")
+        compiled = ripgrep_search.compile()
+
+        assert ("--max-count", "5") in option_pairs(compiled)
+        assert compiled[-1] == str(dataset_dir / "hello_world.go")
 
     def test_add_safe_defaults(self, ripgrep_search: RipGrepSearch):
         _ = ripgrep_search.add_safe_defaults()
         compiled = ripgrep_search.compile()
 
-        assert any("--max-filesize=" in opt for opt in compiled)
-        assert any("--max-count=" in opt for opt in compiled)
-        assert any("--max-depth=" in opt for opt in compiled)
+        assert "--max-filesize" in compiled
+        assert "--max-count" in compiled
+        assert "--max-depth" in compiled
+
+    def test_compile_singular_options_order(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.one_file_system().as_json().auto_hybrid_regex().as_json().add_pattern("test")
+
+        assert ripgrep_search.compile() == snapshot(["rg", "--one-file-system", "--json", "--auto-hybrid-regex", "--regexp", "test"])
 
     def test_auto_hybrid_regex(self, ripgrep_search: RipGrepSearch):
         _ = ripgrep_search.auto_hybrid_regex()
@@ -750,6 +865,14 @@ class TestRipGrepSearch:
         assert "--hidden" in compiled
         assert "--no-ignore" in compiled
 
+    def test_type_defined_with_type_add(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.add_extra_options(["--type-add", "scripts:*.sh"]).include_type("scripts")  # pyright: ignore[reportArgumentType]
+        _ = ripgrep_search.add_pattern("o")  # Found in every file of the dataset
+
+        assert [result.path for result in run_search(ripgrep_search)] == snapshot(
+            [PosixPath("hello_world.sh"), PosixPath("subdir/script_with_hello.sh")]
+        )
+
     def test_no_matches_found(self, ripgrep_search: RipGrepSearch):
         _ = ripgrep_search.add_pattern("xyzabc123notfound")
 
@@ -783,8 +906,8 @@ class TestRipGrepSearch:
         _ = ripgrep_search.add_patterns(["hello", "world"])
         compiled = ripgrep_search.compile()
 
-        assert "--regexp=hello" in compiled
-        assert "--regexp=world" in compiled
+        assert ("--regexp", "hello") in option_pairs(compiled)
+        assert ("--regexp", "world") in option_pairs(compiled)
 
     def test_compile_str(self, ripgrep_search: RipGrepSearch):
         """Test string representation of compiled command."""
@@ -793,15 +916,35 @@ class TestRipGrepSearch:
 
         assert isinstance(cmd_str, str)
         assert "rg" in cmd_str
-        assert "--regexp=test" in cmd_str
-        assert "--max-count=5" in cmd_str
+        assert "--regexp test" in cmd_str
+        assert "--max-count 5" in cmd_str
+
+    def test_compile_sees_fields_set_directly(self, ripgrep_search: RipGrepSearch):
+        """Test that changing the fields directly, rather than through the builder methods, changes the compiled command."""
+        _ = ripgrep_search.add_pattern("test")
+        assert ripgrep_search.compile_str() == snapshot("rg --regexp test")
+
+        ripgrep_search.command = "/usr/bin/rg"
+        ripgrep_search.multiple_options.append("--ignore-case")
+        ripgrep_search.targets.append(Path("my dir"))
+
+        assert ripgrep_search.compile() == snapshot(["/usr/bin/rg", "--regexp", "test", "--ignore-case", "my dir"])
+        assert ripgrep_search.compile_str() == snapshot("/usr/bin/rg --regexp test --ignore-case 'my dir'")
+
+    def test_singular_option_after_replacing_singular_options(self, ripgrep_search: RipGrepSearch):
+        _ = ripgrep_search.as_json()
+        ripgrep_search.singular_options = []
+
+        _ = ripgrep_search.as_json().as_json()
+
+        assert ripgrep_search.singular_options == ["--json"]
 
     def test_max_file_size(self, ripgrep_search: RipGrepSearch):
         """Test max file size option."""
         _ = ripgrep_search.max_file_size(1024)
         compiled = ripgrep_search.compile()
 
-        assert "--max-filesize=1024" in compiled
+        assert ("--max-filesize", "1024") in option_pairs(compiled)
 
 
 class TestRipGrepFind:
@@ -809,7 +952,7 @@ class TestRipGrepFind:
         ripgrep_find = RipGrepFind(working_directory=dataset_dir)
         assert ripgrep_find.working_directory == dataset_dir
         assert ripgrep_find.command == "rg"
-        assert ripgrep_find.singular_options == set()
+        assert ripgrep_find.singular_options == []
         assert ripgrep_find.multiple_options == []
         assert ripgrep_find.targets == []
 
@@ -823,8 +966,14 @@ class TestRipGrepFind:
 
         assert compiled[0] == "rg"
         assert "--files" not in compiled  # Only added during run()
-        assert "--type=py" in compiled
-        assert "--max-depth=2" in compiled
+        assert ("--type", "py") in option_pairs(compiled)
+        assert ("--max-depth", "2") in option_pairs(compiled)
+
+    def test_unlisted_type(self, ripgrep_find: RipGrepFind):
+        """Types missing from RIPGREP_TYPE_LIST, such as ones defined with --type-add, are passed through to ripgrep."""
+        _ = ripgrep_find.include_types(["py", "mytype"]).exclude_type("othertype")  # pyright: ignore[reportArgumentType]
+
+        assert ripgrep_find.multiple_options == snapshot(["--type", "py", "--type", "mytype", "--type-not", "othertype"])
 
     def test_set_working_directory(self, dataset_dir: Path):
         find = RipGrepFind()
@@ -835,7 +984,7 @@ class TestRipGrepFind:
         _ = ripgrep_find.add_safe_defaults()
         compiled = ripgrep_find.compile()
 
-        assert any("--max-depth=15" in opt for opt in compiled)
+        assert ("--max-depth", "15") in option_pairs(compiled)
 
     def test_one_file_system(self, ripgrep_find: RipGrepFind):
         _ = ripgrep_find.one_file_system()
@@ -877,8 +1026,34 @@ class TestRipGrepFind:
 
         assert isinstance(cmd_str, str)
         assert "rg" in cmd_str
-        assert "--max-depth=2" in cmd_str
-        assert "--type=py" in cmd_str
+        assert "--max-depth 2" in cmd_str
+        assert "--type py" in cmd_str
+
+    def test_run_paths_raw(self, ripgrep_find: RipGrepFind):
+        _ = ripgrep_find.include_globs(["*.sh"])
+
+        sync_results = sorted(ripgrep_find.run_paths_raw())
+        async_results = sorted(_RUNNER.run(collect(ripgrep_find.arun_paths_raw())))
+
+        assert sync_results == async_results == snapshot([b"hello_world.sh", b"subdir/script_with_hello.sh"])
+
+    def test_run_keeps_trailing_whitespace(self, tmp_path: Path):
+        _ = (tmp_path / "trail ").write_text("hello\n")
+        ripgrep_find = RipGrepFind(working_directory=tmp_path)
+
+        paths = list(ripgrep_find.run())
+
+        assert paths == _RUNNER.run(collect(ripgrep_find.arun())) == snapshot([PosixPath("trail ")])
+        assert [os.fsencode(path) for path in paths] == list(ripgrep_find.run_paths_raw())
+
+    def test_compile_str_quotes_arguments(self, ripgrep_find: RipGrepFind):
+        _ = ripgrep_find.include_glob("my file*.txt")
+
+        assert ripgrep_find.compile_str() == snapshot("rg --glob 'my file*.txt'")
+
+        _ = ripgrep_find.max_depth(2)
+
+        assert ripgrep_find.compile_str() == snapshot("rg --glob 'my file*.txt' --max-depth 2")
 
     def test_include_globs(self, ripgrep_find: RipGrepFind):
         _ = ripgrep_find.include_globs(["*.py"])
@@ -940,14 +1115,153 @@ class TestRipGrepFind:
 
         # Should be in reverse alphabetical order
         paths = [str(r) for r in results]
-        assert paths == sorted(paths, reverse=True)
+        assert all(a >= b for a, b in pairwise(paths))
 
 
-class TestErrorHandling:
+class TestRunMany:
+    async def test_arun_many(self, dataset_dir: Path):
+        searches = [
+            RipGrepSearch(working_directory=dataset_dir).add_pattern("hello"),
+            RipGrepSearch(working_directory=dataset_dir).add_pattern("xyzabc123notfound"),
+            RipGrepSearch(working_directory=dataset_dir).add_pattern("echo"),
+        ]
+
+        results = [(index, result.path) async for index, result in arun_many(searches, concurrency=2)]
+
+        assert sorted(results) == snapshot(
+            [(0, PosixPath("hello_world.go")), (2, PosixPath("hello_world.sh")), (2, PosixPath("subdir/script_with_hello.sh"))]
+        )
+
+    async def test_arun_many_finds(self, dataset_dir: Path):
+        finds = [
+            RipGrepFind(working_directory=dataset_dir).include_globs(["*.go"]),
+            RipGrepFind(working_directory=dataset_dir).include_globs(["*.sh"]),
+        ]
+
+        results = await collect(arun_many(finds))
+
+        assert sorted(results) == snapshot(
+            [(0, PosixPath("hello_world.go")), (1, PosixPath("hello_world.sh")), (1, PosixPath("subdir/script_with_hello.sh"))]
+        )
+
+    @pytest.fixture
+    def spawned(self, monkeypatch: pytest.MonkeyPatch) -> list[asyncio.subprocess.Process]:
+        """Record every ripgrep process the async runs start."""
+        processes: list[asyncio.subprocess.Process] = []
+
+        async def create_subprocess_exec(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+            process = await asyncio.create_subprocess_exec(*args, **kwargs)
+            processes.append(process)
+            return process
+
+        monkeypatch.setattr(base, "create_subprocess_exec", create_subprocess_exec)
+        return processes
+
     @pytest.fixture
-    def dataset_dir(self) -> Path:
-        return Path(__file__).parent / "dataset"
+    def large_dir(self, tmp_path: Path) -> Path:
+        """A match in the first file, followed by enough text without matches that ripgrep is still searching after reporting it."""
+        _ = (tmp_path / "a_match.txt").write_text("hello world\n")
+        for index in range(4):
+            _ = (tmp_path / f"b_large_{index}.txt").write_text("goodbye world\n" * 1_000_000)
+        return tmp_path
+
+    async def test_arun_many_stops_early(
+        self, large_dir: Path, spawned: list[asyncio.subprocess.Process], recwarn: pytest.WarningsRecorder
+    ):
+        searches = [RipGrepSearch(working_directory=large_dir).add_pattern("hello").sort("path") for _ in range(4)]
 
+        async with aclosing(arun_many(searches)) as results:
+            async for _ in results:
+                break
+
+        assert spawned
+        assert [process.returncode is not None for process in spawned] == [True] * len(spawned)
+
+        # Unclosed transports and un-retrieved exceptions are reported when they are garbage collected.
+        _ = gc.collect()
+        assert [str(warning.message) for warning in recwarn if issubclass(warning.category, ResourceWarning)] == []
+
+    async def test_arun_many_raises_failure(
+        self, large_dir: Path, spawned: list[asyncio.subprocess.Process], recwarn: pytest.WarningsRecorder
+    ):
+        searches = [
+            RipGrepSearch(working_directory=large_dir).add_pattern("hello").sort("path"),
+            # --no-json overrides the --json that `arun` adds, so parsing the first line fails while ripgrep is still searching.
+            RipGrepSearch(working_directory=large_dir).add_pattern("hello").sort("path").add_extra_options(["--no-json"]),
+        ]
+
+        with pytest.raises(orjson.JSONDecodeError):
+            _ = await collect(arun_many(searches))
+
+        assert len(spawned) == 2
+        assert [process.returncode is not None for process in spawned] == [True] * len(spawned)
+
+        _ = gc.collect()
+        assert [str(warning.message) for warning in recwarn if issubclass(warning.category, ResourceWarning)] == []
+
+
+class TestLineReader:
+    def test_lines_split_across_chunks(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(base, "READ_CHUNK_SIZE", 4)
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, "wb") as writer:
+            _ = writer.write(b'{"a": 1}\n{"b": 2}\n\n{"c": 3}')
+
+        with os.fdopen(read_fd, "rb") as reader:
+            assert list(chain.from_iterable(base._iter_line_batches(reader.fileno()))) == [b'{"a": 1}', b'{"b": 2}', b"", b'{"c": 3}']  # pyright: ignore[reportPrivateUsage]
+
+    def test_line_longer_than_many_chunks(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(base, "READ_CHUNK_SIZE", 7)
+        long_line = b"x" * 1000
+        data = b"a\n" + long_line + b"\nb\n" + long_line
+
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, "wb") as writer:
+            _ = writer.write(data)
+
+        with os.fdopen(read_fd, "rb") as reader:
+            assert list(chain.from_iterable(base._iter_line_batches(reader.fileno()))) == [b"a", long_line, b"b", long_line]  # pyright: ignore[reportPrivateUsage]
+
+        async def read_async() -> list[bytes]:
+            stream = asyncio.StreamReader()
+            stream.feed_data(data)
+            stream.feed_eof()
+            return list(chain.from_iterable(await collect(base._aiter_line_batches(stream))))  # pyright: ignore[reportPrivateUsage]
+
+        assert _RUNNER.run(read_async()) == [b"a", long_line, b"b", long_line]
+
+    @pytest.mark.skipif(not Path("/proc/self/fd").is_dir(), reason="needs F_SETPIPE_SZ and /proc")
+    def test_pipe_size_refused(self, dataset_dir: Path, monkeypatch: pytest.MonkeyPatch):
+        import fcntl
+
+        set_pipe_size = fcntl.fcntl
+
+        def refuse_pipe_size(fd: int, cmd: int, arg: int = 0) -> int:
+            if cmd == fcntl.F_SETPIPE_SZ:
+                raise PermissionError(1, "Operation not permitted")
+            return set_pipe_size(fd, cmd, arg)
+
+        monkeypatch.setattr(fcntl, "fcntl", refuse_pipe_size)
+        fd_dir = Path("/proc/self/fd")
+        open_fds = len(list(fd_dir.iterdir()))
+
+        results = list(RipGrepFind(working_directory=dataset_dir).include_globs(["*.sh"]).run())
+
+        assert sorted(results) == snapshot([PosixPath("hello_world.sh"), PosixPath("subdir/script_with_hello.sh")])
+        assert len(list(fd_dir.iterdir())) == open_fds
+
+    def test_run_stops_early(self, tmp_path: Path):
+        # The second file matches on far more lines than the pipe holds, so ripgrep is blocked writing when the results are closed.
+        _ = (tmp_path / "a_first.txt").write_text("hello\n")
+        _ = (tmp_path / "b_many.txt").write_text("hello\n" * 500_000)
+        results = RipGrepSearch(working_directory=tmp_path).add_pattern("hello").sort("path").run()
+
+        assert next(results).path == Path("a_first.txt")
+
+        results.close()
+
+
+class TestErrorHandling:
     def test_invalid_working_directory(self):
         """Test that running with non-existent directory fails gracefully."""
         search = RipGrepSearch(working_directory=Path("/nonexistent/path/that/doesnt/exist"))
@@ -72,3 +72,5 @@ def test_conversion():
             matched_lines=[MatchedLine(match={1: "def hello():"}), MatchedLine(match={2: "    print('hello, world!')"})],
         )
     )
+
+    assert MatchedFile.from_search_results([result, result], 0, 0, max_workers=2) == [matched_file, matched_file]